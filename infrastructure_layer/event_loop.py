@@ -0,0 +1,32 @@
+# adlytics/infrastructure_layer/event_loop.py
+import asyncio
+import logging
+import sys
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+from infrastructure_layer.settings import settings
+
+logger = logging.getLogger("event_loop")
+
+T = TypeVar("T")
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """
+    Точка запуска асинхронных сервисов вместо asyncio.run().
+    Использует uvloop, если это разрешено настройками (USE_UVLOOP)
+    и поддерживается платформой; иначе — стандартный event loop.
+    Политика event loop не меняется: uvloop.run() создаёт цикл через
+    loop_factory, что не затрагивает устаревающий в Python 3.14 API политик.
+    """
+    if settings.USE_UVLOOP and sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            logger.warning("uvloop не установлен, используется стандартный event loop")
+        else:
+            logger.info("Event loop: uvloop")
+            return uvloop.run(main)
+
+    return asyncio.run(main)
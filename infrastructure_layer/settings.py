@@ -1,4 +1,7 @@
 # adlytics/infrastructure_layer/settings.py
+from functools import lru_cache
+
+from pydantic import SecretStr
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -8,13 +11,26 @@ class Settings(BaseSettings):
     """
 
     # Telegram
-    TELEGRAM_BOT_TOKEN: str
+    TELEGRAM_BOT_TOKEN: SecretStr
 
     # Kafka
     KAFKA_BROKER_URL: str
     KAFKA_TOPIC_NOTIFICATIONS: str
     KAFKA_TOPIC_FAILED: str  # топик для неотправленных сообщений
 
+    # Email (SMTP)
+    SMTP_HOST: str = ""
+    SMTP_PORT: int = 587
+    SMTP_USER: str = ""
+    SMTP_PASSWORD: SecretStr = SecretStr("")
+    SMTP_USE_TLS: bool = True
+    SMTP_FROM_EMAIL: str = ""
+
+    # SMS
+    SMS_PROVIDER_URL: str = ""
+    SMS_API_TOKEN: SecretStr = SecretStr("")
+    SMS_SENDER_ID: str = ""
+
     # Redis
     REDIS_URL: str
     REDIS_CACHE_TTL: int = 300  # по умолчанию 5 минут
@@ -22,6 +38,9 @@ class Settings(BaseSettings):
     # SQLite
     SQLITE_DB_PATH: str = "data/notifications.db"
 
+    # Event loop: uvloop вместо стандартного asyncio (только Linux/macOS)
+    USE_UVLOOP: bool = True
+
     # Логирование
     LOG_LEVEL: str = "INFO"
     LOG_FILE_PATH: str = "logs/notifications.log"
@@ -32,5 +51,14 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Возвращает единственный экземпляр настроек.
+    .env читается и валидируется только при первом вызове.
+    """
+    return Settings()
+
+
 # Создаём единый экземпляр для импорта во все сервисы
-settings = Settings()
+settings = get_settings()
@@ -0,0 +1,27 @@
+# ingestion/base_client.py
+"""
+Обратная совместимость: единственная реализация BaseClient
+находится в ingestion_service.base_client.
+"""
+
+from ingestion_service.base_client import (
+    BaseClient,
+    JSONPrimitive,
+    JSONType,
+    JSONValue,
+    ResponseBody,
+    StreamedBody,
+    close_session,
+    get_session,
+)
+
+__all__ = [
+    "BaseClient",
+    "JSONPrimitive",
+    "JSONType",
+    "JSONValue",
+    "ResponseBody",
+    "StreamedBody",
+    "close_session",
+    "get_session",
+]
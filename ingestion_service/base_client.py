@@ -1,15 +1,19 @@
-# ingestion/base_client.py
+# ingestion_service/base_client.py
 
 from __future__ import annotations
 
 import asyncio
 import aiohttp
-import backoff
 import logging
+import orjson
+import random
 
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 from aiolimiter import AsyncLimiter
-from typing import TypeVar, TypeAlias
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, TypeVar, TypeAlias
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
@@ -21,6 +25,113 @@ ResponseBody: TypeAlias = JSONType | str | bytes
 
 T = TypeVar("T", bound=ResponseBody)
 
+# Статусы, при которых сервер просит подождать и может прислать Retry-After
+THROTTLE_STATUSES: frozenset[int] = frozenset({429, 503})
+
+# Размер чанка при потоковом чтении ответа
+STREAM_CHUNK_SIZE = 65536
+
+# Пустой лимитер для клиентов, ограниченных только min_interval
+_NO_LIMIT = nullcontext()
+
+# Общие сессии по event loop: сессия и её пул привязаны к циклу,
+# в котором созданы, и не могут использоваться из другого
+_shared_sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+
+def _json_dumps(obj: JSONType) -> str:
+    """
+    Сериализует тело запроса через orjson.
+    aiohttp ожидает str (сам кодирует результат), поэтому bytes декодируются.
+    """
+    return orjson.dumps(obj).decode()
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Возвращает общую для всех клиентов aiohttp-сессию текущего event loop.
+    Пул соединений и DNS-кеш переиспользуются между экземплярами BaseClient,
+    поэтому TCP/TLS-рукопожатие выполняется один раз на хост, а не на клиент.
+    Сессии завершившихся циклов (например, после asyncio.run) закрываются здесь.
+    """
+    loop = asyncio.get_running_loop()
+
+    for stale_loop in [
+        loop_ for loop_ in _shared_sessions if loop_.is_closed()
+    ]:
+        # цикл уже закрыт: close() лишь помечает соединения закрытыми
+        await _shared_sessions.pop(stale_loop).close()
+        logger.debug("Closed aiohttp ClientSession of a finished event loop")
+
+    session = _shared_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=200,
+            limit_per_host=32,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True,
+        )
+        session = _shared_sessions[loop] = aiohttp.ClientSession(
+            connector=connector,
+            # явно, для прокси, которые вырезают заголовок
+            headers={"Connection": "keep-alive"},
+            timeout=aiohttp.ClientTimeout(connect=10),
+            json_serialize=_json_dumps,
+        )
+        logger.debug("Created shared aiohttp ClientSession")
+    return session
+
+
+async def close_session() -> None:
+    """
+    Закрывает общую aiohttp-сессию текущего event loop.
+    Вызывается при остановке приложения, до завершения цикла.
+    """
+    session = _shared_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+        logger.debug("Shared aiohttp ClientSession closed")
+
+
+class StreamedBody:
+    """
+    Тело ответа, читаемое чанками по STREAM_CHUNK_SIZE байт.
+    Соединение освобождается при выходе из async with, по окончании итерации
+    или вызовом release(). Без async with непрочитанное тело держит
+    соединение до сборки мусора, поэтому рекомендуемый способ:
+
+        async with await client.get("export", stream=True) as body:
+            async for chunk in body:
+                ...
+    """
+
+    def __init__(self, resp: aiohttp.ClientResponse) -> None:
+        self._resp = resp
+
+    @property
+    def closed(self) -> bool:
+        """Освобождено ли соединение."""
+        return self._resp.closed
+
+    def release(self) -> None:
+        """Возвращает соединение в пул; непрочитанный остаток тела отбрасывается."""
+        self._resp.release()
+
+    async def __aenter__(self) -> StreamedBody:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            self.release()
+
 
 class BaseClient(ABC):
     """
@@ -33,26 +144,41 @@ class BaseClient(ABC):
         *,
         token: str | None = None,
         headers: dict[str, str] | None = None,
-        max_rate: int = 5,
+        max_rate: int | None = None,
         rate_period: int = 1,
         max_retries: int = 3,
         timeout: int = 30,
         backoff_max_tries: int | None = None,
         limiter: AsyncLimiter | None = None,
+        min_interval: float | None = None,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        jitter: float = 0.5,
+        bucket_max_rate: int | None = None,
+        bucket_rate_period: int = 1,
     ) -> None:
         """
         Параметры:
         - base_url: базовый URL API (без завершающего '/')
         - token: строка авторизации (Bearer token)
         - headers: дополнительные HTTP-заголовки
-        - max_rate: лимит количества запросов (по умолчанию 5)
+        - max_rate: лимит количества запросов (по умолчанию 5, если не задан min_interval)
         - rate_period: интервал (в секундах), на который распространяется лимит
         - max_retries: число попыток при ошибках
         - timeout: таймаут HTTP-запросов
-        - backoff_max_tries: ограничение числа ретраев при backoff
+        - backoff_max_tries: ограничение числа попыток запроса
         - limiter: внешний AsyncLimiter (опционально)
+        - min_interval: минимальный интервал (в секундах) между запросами;
+          если задан без max_rate и limiter, AsyncLimiter не создаётся
+        - base_delay: начальная задержка backoff (в секундах)
+        - max_delay: верхняя граница задержки backoff (в секундах)
+        - jitter: доля случайной добавки к задержке
+        - bucket_max_rate: лимит запросов на отдельный bucket (см. _bucket_key);
+          общий limiter при этом остаётся верхней границей для всех bucket
+        - bucket_rate_period: интервал (в секундах) для bucket_max_rate
         """
         self.base_url: str = base_url.rstrip("/")
+        self._url_prefix: str = self.base_url + "/"
         self.token: str | None = token
         self.headers: dict[str, str] = headers.copy() if headers else {}
 
@@ -62,17 +188,43 @@ class BaseClient(ABC):
         self.max_retries: int = max_retries
         self.timeout: int = timeout
         self.backoff_max_tries: int = backoff_max_tries or max_retries
+        self._timeout = aiohttp.ClientTimeout(total=timeout, connect=10)
+        # Потоковое тело может читаться сколь угодно долго: ограничиваем
+        # только паузу между порциями данных, а не общее время
+        self._stream_timeout = aiohttp.ClientTimeout(
+            total=None, connect=10, sock_read=timeout
+        )
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.jitter: float = jitter
+
+        # Собственный лимитер пересоздаётся при смене event loop, внешний — нет
+        self._owns_limiter: bool = False
+        if limiter is None and (max_rate is not None or min_interval is None):
+            max_rate = max_rate or 5
+            limiter = AsyncLimiter(max_rate, rate_period)
+            self._owns_limiter = True
+        self.limiter: AsyncLimiter | None = limiter
 
-        self.limiter: AsyncLimiter = limiter or AsyncLimiter(max_rate, rate_period)
+        self.bucket_max_rate: int | None = bucket_max_rate
+        self.bucket_rate_period: int = bucket_rate_period
+        self._limiters: dict[str, AsyncLimiter] = {}
+
+        self.min_interval: float | None = min_interval
+        self._bucket_capacity: float = 1.0
+        self._tokens: float = self._bucket_capacity
+        self._updated: float | None = None
 
         self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
 
         logger.debug(
-            "BaseClient initialized: %s (timeout=%ss, rate=%d/%ds)",
+            "BaseClient initialized: %s (timeout=%ss, rate=%s/%ds, min_interval=%s)",
             self.base_url,
             self.timeout,
             max_rate,
             rate_period,
+            min_interval,
         )
 
     async def __aenter__(self) -> BaseClient:
@@ -86,28 +238,122 @@ class BaseClient(ABC):
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         """
         Асинхронный выход из контекста.
+        Общая сессия не закрывается — для этого есть close_session().
         """
-        if self._session and not self._session.closed:
-            await self._session.close()
-            logger.debug("Aiohttp session closed for %s", self.base_url)
+        self._session = None
+        logger.debug("Aiohttp session released for %s", self.base_url)
 
     async def _ensure_session(self) -> None:
         """
         Гарантирует наличие открытой aiohttp-сессии.
-        Создаёт новую сессию, если текущая отсутствует или закрыта.
-        """
-        if self._session is None or self._session.closed:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self._session = aiohttp.ClientSession(headers=self.headers, timeout=timeout)
-            logger.debug("Created aiohttp ClientSession for %s", self.base_url)
-
-    @backoff.on_exception(
-        backoff.expo,
-        (aiohttp.ClientError, asyncio.TimeoutError),
-        max_tries=lambda self: self.backoff_max_tries,
-        jitter=backoff.full_jitter,
-        logger=logger,
-    )
+        Берёт общую сессию, если текущая отсутствует, закрыта
+        или принадлежит другому event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session_loop is not None and self._session_loop is not loop:
+            # AsyncLimiter привязан к циклу, в котором впервые ожидал
+            if self._owns_limiter:
+                self.limiter = AsyncLimiter(self.limiter.max_rate, self.limiter.time_period)
+            self._limiters.clear()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = await get_session()
+            self._session_loop = loop
+            logger.debug("Using shared aiohttp ClientSession for %s", self.base_url)
+
+    def _bucket_key(self, endpoint: str) -> str:
+        """
+        Ключ bucket для лимитов по эндпоинтам: первый сегмент пути без query-строки.
+        Переопределяется в наследниках, если квоты API устроены иначе.
+        """
+        path = endpoint.split("?", 1)[0]
+        return path.lstrip("/").split("/", 1)[0]
+
+    def _get_limiter(self, bucket_key: str) -> AsyncLimiter | None:
+        """
+        Возвращает лимитер bucket, создавая его при первом обращении.
+        Блокировка не нужна: между setdefault и созданием лимитера нет await.
+        """
+        if self.bucket_max_rate is None:
+            return None
+        limiter = self._limiters.get(bucket_key)
+        if limiter is None:
+            limiter = self._limiters.setdefault(
+                bucket_key, AsyncLimiter(self.bucket_max_rate, self.bucket_rate_period)
+            )
+        return limiter
+
+    async def _throttle(self) -> None:
+        """
+        Выдерживает min_interval между запросами по схеме token bucket.
+        Токен забирается сразу, даже в долг (баланс уходит в минус), и корутина
+        спит ровно до момента, когда её токен накопится. Так ожидающие
+        обслуживаются в порядке очереди (FIFO) и просыпаются по одному разу.
+        Блокировка не нужна: между await корутины выполняются в одном
+        event loop последовательно.
+        """
+        if not self.min_interval:
+            return
+
+        rate = 1 / self.min_interval
+        now = asyncio.get_running_loop().time()
+        if self._updated is not None:
+            self._tokens = min(
+                self._bucket_capacity,
+                self._tokens + (now - self._updated) * rate,
+            )
+        self._updated = now
+
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return
+
+        # Токен отменённого ожидания не возвращается: время сна остальных уже
+        # рассчитано, и возврат отдал бы новому вызову занятый слот.
+        await asyncio.sleep(-self._tokens / rate)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Ограниченная экспоненциальная задержка со случайной добавкой.
+        """
+        delay = min(self.max_delay, self.base_delay * 2**attempt)
+        return delay * (1 + random.uniform(0, self.jitter))
+
+    @staticmethod
+    def _retry_after(resp: aiohttp.ClientResponse) -> float | None:
+        """
+        Возвращает паузу из заголовка Retry-After (секунды или HTTP-дата).
+        """
+        value = resp.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    @staticmethod
+    def _is_json(resp: aiohttp.ClientResponse) -> bool:
+        """Проверяет по Content-Type, что тело ответа — JSON."""
+        content_type = resp.content_type
+        return content_type == "application/json" or content_type.endswith("+json")
+
+    @classmethod
+    async def _read_body(cls, resp: aiohttp.ClientResponse) -> ResponseBody | None:
+        """
+        Читает тело ответа целиком: JSON разбирается через orjson, остальное — как текст.
+        """
+        body = await resp.read()
+        if cls._is_json(resp):
+            return orjson.loads(body) if body else None
+        return body.decode(resp.get_encoding(), errors="replace")
+
     async def _request(
         self,
         method: str,
@@ -117,37 +363,116 @@ class BaseClient(ABC):
         json: JSONType | None = None,
         data: bytes | str | None = None,
         headers: dict[str, str] | None = None,
+        stream: bool = False,
     ) -> T:
         """
         Выполняет асинхронный HTTP-запрос с учётом лимитов и повторных попыток.
+        При stream=True возвращает StreamedBody вместо разобранного содержимого;
+        таймаут в этом случае ограничивает паузы чтения, а не всё время запроса.
+
+        Политика повторов:
+        - 429/503: ждём столько, сколько указано в Retry-After (иначе backoff);
+          если Retry-After больше max_delay — ошибка сразу, без ожидания;
+        - прочие 5xx, ошибки соединения, оборванное тело ответа и таймауты:
+          повтор с backoff;
+        - прочие 4xx: ошибка сразу, без повторов;
+        - POST повторяется только при наличии заголовка Idempotency-Key.
         """
 
         await self._ensure_session()
 
-        url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
-        merged_headers = {**self.headers, **(headers or {})}
-
-        async with self.limiter:
-            async with self._session.request(
-                method=method.upper(),
-                url=url,
-                params=params,
-                json=json,
-                data=data,
-                headers=merged_headers,
-            ) as resp:
-                if resp.status >= 400:
-                    # читаемый и безопасный вывод ошибки
-                    body = await resp.text()
-                    logger.warning(
-                        "Request %s %s failed (%d): %s", method, url, resp.status, body
+        method = method.upper()
+        url = self._url_prefix + endpoint.lstrip("/")
+        merged_headers = {**self.headers, **headers} if headers else self.headers
+        bucket_limiter = self._get_limiter(self._bucket_key(endpoint))
+
+        retryable = method != "POST" or any(
+            key.lower() == "idempotency-key" for key in merged_headers
+        )
+        max_tries = max(1, self.backoff_max_tries) if retryable else 1
+
+        for attempt in range(max_tries):
+            is_last = attempt == max_tries - 1
+            await self._throttle()
+
+            try:
+                # AsyncLimiter не удерживает внутренних блокировок во время ожидания,
+                # а других await под пользовательскими блокировками здесь нет.
+                # Сначала квота bucket, затем общий лимит, чтобы не занимать
+                # общую квоту, пока ждём свою.
+                async with bucket_limiter or _NO_LIMIT, self.limiter or _NO_LIMIT:
+                    resp = await self._session.request(
+                        method=method,
+                        url=url,
+                        params=params,
+                        json=json,
+                        data=data,
+                        headers=merged_headers,
+                        timeout=self._stream_timeout if stream else self._timeout,
                     )
-                    resp.raise_for_status()
 
                 try:
-                    return await resp.json()
-                except aiohttp.ContentTypeError:
-                    return await resp.text()
+                    if resp.status < 400:
+                        if stream:
+                            body = StreamedBody(resp)
+                            resp = None  # соединением теперь владеет StreamedBody
+                            return body
+                        return await self._read_body(resp)
+
+                    # читаемый и безопасный вывод ошибки; тело читаем только
+                    # если предупреждение действительно будет записано
+                    if logger.isEnabledFor(logging.WARNING):
+                        body = await resp.text()
+                        logger.warning(
+                            "Request %s %s failed (%d): %s", method, url, resp.status, body
+                        )
+                    if resp.status < 500 and resp.status not in THROTTLE_STATUSES:
+                        resp.raise_for_status()
+                    if is_last:
+                        resp.raise_for_status()
+
+                    delay = None
+                    if resp.status in THROTTLE_STATUSES:
+                        delay = self._retry_after(resp)
+                    if delay is not None and delay > self.max_delay:
+                        # ждать дольше max_delay не имеет смысла — отдаём ошибку сразу
+                        logger.warning(
+                            "Request %s %s: Retry-After %.0fs exceeds max_delay %.0fs",
+                            method,
+                            url,
+                            delay,
+                            self.max_delay,
+                        )
+                        resp.raise_for_status()
+                    if delay is None:
+                        delay = self._backoff_delay(attempt)
+                finally:
+                    if resp is not None:
+                        resp.release()
+
+            except (
+                aiohttp.ClientConnectionError,
+                aiohttp.ClientPayloadError,
+                asyncio.TimeoutError,
+            ) as e:
+                if is_last:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(
+                    "Request %s %s failed (%s), retrying", method, url, type(e).__name__
+                )
+
+            logger.info(
+                "Retrying %s %s in %.2fs (attempt %d/%d)",
+                method,
+                url,
+                delay,
+                attempt + 2,
+                max_tries,
+            )
+            await asyncio.sleep(delay)
+
+        raise RuntimeError("unreachable")
 
     async def get(
         self,
@@ -155,9 +480,12 @@ class BaseClient(ABC):
         *,
         params: dict[str, str] | None = None,
         headers: dict[str, str] | None = None,
-    ) -> ResponseBody:
+        stream: bool = False,
+    ) -> ResponseBody | StreamedBody:
         """Выполняет GET-запрос к API."""
-        return await self._request("GET", endpoint, params=params, headers=headers)
+        return await self._request(
+            "GET", endpoint, params=params, headers=headers, stream=stream
+        )
 
     async def post(
         self,
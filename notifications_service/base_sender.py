@@ -11,3 +11,9 @@ class BaseSender(ABC):
         """
         pass
 
+    async def close(self):
+        """
+        Освобождает ресурсы отправителя (соединения, пулы) при остановке приложения.
+        По умолчанию ничего не делает.
+        """
+        pass
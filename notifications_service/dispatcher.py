@@ -1,32 +1,103 @@
 # notifications_service/dispatcher.py
+import asyncio
 import logging
+from notifications_service.base_sender import BaseSender
+from notifications_service.email_sender.email_sender import EmailSender
+from notifications_service.sms_sender.sms_sender import SmsSender
 from notifications_service.tg_sender.telegram_sender import TelegramSender
 
 logger = logging.getLogger("dispatcher")
 
+# Сколько сообщений пачки отправляется одновременно
+MAX_CONCURRENT_TASKS = 50
+
+
+async def _unsupported(message: dict):
+    """Заглушка для каналов, у которых нет отправителя."""
+    logger.error("Dispatcher: канал '%s' не поддерживается", message.get("channel"))
+    return False
+
+
 class NotificationDispatcher:
     """Центральный диспетчер для отправки уведомлений через разные каналы."""
 
-    def __init__(self):
-        self.senders = {
-            "telegram": TelegramSender(),
-            # "email": EmailSender(),
-            # "sms": SMSSender(),
+    def __init__(self, max_concurrent_tasks: int = MAX_CONCURRENT_TASKS):
+        # Отправители создаются при первом сообщении в канал, а не заранее
+        self._factories: dict[str, type[BaseSender]] = {
+            "telegram": TelegramSender,
+            "email": EmailSender,
+            "sms": SmsSender,
         }
+        self._instances: dict[str, BaseSender] = {}
+        self._send_by_channel = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent_tasks)
+
+    def _get_send(self, channel):
+        """
+        Возвращает связанный метод отправки для канала, создавая отправителя при первом обращении.
+        """
+        send = self._send_by_channel.get(channel)
+        if send is None:
+            factory = self._factories.get(channel)
+            if factory is None:
+                return _unsupported
+            sender = self._instances[channel] = factory()
+            send = self._send_by_channel[channel] = sender._send
+        return send
 
     async def send(self, message: dict):
         """
         Унифицированный метод отправки уведомлений.
         """
-        channel = message.get("channel")
-        sender = self.senders.get(channel)
+        channel = message["channel"] if "channel" in message else None
+        send = self._get_send(channel)
 
-        if not sender:
-            logger.error(f"Dispatcher: канал '{channel}' не поддерживается")
-            return False
+        if send is _unsupported:
+            return await _unsupported(message)
 
-        logger.info(f"Dispatcher: начинаю отправку через {channel}")
-        success = await sender._send(message)
-        logger.info(f"Dispatcher: отправка завершена, статус={success}")
+        logger.info("Dispatcher: начинаю отправку через %s", channel)
+        success = await send(message)
+        logger.info("Dispatcher: отправка завершена, статус=%s", success)
 
         return success
+
+    async def close(self):
+        """
+        Закрывает созданных отправителей. Вызывается при остановке приложения.
+        """
+        for channel, sender in self._instances.items():
+            try:
+                await sender.close()
+            except Exception as e:
+                logger.error("Dispatcher: ошибка при закрытии канала %s: %s", channel, e)
+        self._instances.clear()
+        self._send_by_channel.clear()
+
+    async def _send_bounded(self, message: dict):
+        """Отправка одного сообщения с ограничением параллелизма."""
+        async with self._semaphore:
+            return await self.send(message)
+
+    async def send_batch(self, messages: list[dict]) -> list[bool]:
+        """
+        Параллельная отправка пачки уведомлений.
+        Ошибка в одном сообщении не прерывает остальные: для него возвращается False.
+        """
+        results = await asyncio.gather(
+            *(self._send_bounded(message) for message in messages),
+            return_exceptions=True,
+        )
+
+        statuses = []
+        for message, result in zip(messages, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Dispatcher: ошибка при отправке через %s: %s",
+                    message.get("channel"),
+                    result,
+                    exc_info=result,
+                )
+                statuses.append(False)
+            else:
+                statuses.append(bool(result))
+        return statuses
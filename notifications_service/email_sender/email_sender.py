@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import time
 from email.message import EmailMessage
 from aiosmtplib import SMTP, SMTPException
 from notifications_service.base_sender import BaseSender
@@ -6,6 +8,17 @@ from infrastructure_layer.settings import settings
 
 logger = logging.getLogger("email_sender")
 
+# Параметры SMTP читаются из настроек один раз при импорте
+_SMTP_HOST = settings.SMTP_HOST
+_SMTP_PORT = settings.SMTP_PORT
+_SMTP_USE_TLS = settings.SMTP_USE_TLS
+_SMTP_USER = settings.SMTP_USER
+_SMTP_PASSWORD = settings.SMTP_PASSWORD.get_secret_value()
+_SMTP_FROM_EMAIL = settings.SMTP_FROM_EMAIL
+
+# Через сколько секунд простоя соединение проверяется командой NOOP
+_SMTP_KEEPALIVE_INTERVAL = 60.0
+
 
 class EmailSender(BaseSender):
     """
@@ -13,8 +26,49 @@ class EmailSender(BaseSender):
     """
 
     def __init__(self):
+        self._smtp: SMTP | None = None
+        self._smtp_lock = asyncio.Lock()
+        self._last_used: float = 0.0
         logger.info("EmailSender: отправитель создан")
 
+    async def _ensure_smtp(self) -> SMTP:
+        """
+        Возвращает открытое SMTP-соединение, создавая и авторизуя его при необходимости.
+        Вызывается под self._smtp_lock.
+        """
+        if self._smtp is not None and self._smtp.is_connected:
+            if time.monotonic() - self._last_used < _SMTP_KEEPALIVE_INTERVAL:
+                return self._smtp
+            try:
+                await self._smtp.noop()
+                return self._smtp
+            except SMTPException:
+                logger.info("EmailSender: SMTP-соединение устарело, переподключаюсь")
+                self._smtp.close()
+
+        smtp = SMTP(hostname=_SMTP_HOST, port=_SMTP_PORT, start_tls=_SMTP_USE_TLS)
+        self._smtp = None
+        await smtp.connect()
+        if _SMTP_USER and _SMTP_PASSWORD:
+            try:
+                await smtp.login(_SMTP_USER, _SMTP_PASSWORD)
+            except BaseException:
+                # новое соединение ещё не сохранено в self._smtp — закрываем его здесь
+                smtp.close()
+                raise
+        self._smtp = smtp
+        return smtp
+
+    async def close(self) -> None:
+        """Закрывает SMTP-соединение при остановке приложения."""
+        async with self._smtp_lock:
+            if self._smtp is not None and self._smtp.is_connected:
+                try:
+                    await self._smtp.quit()
+                except SMTPException:
+                    self._smtp.close()
+            self._smtp = None
+
     async def _send(self, message: dict):
         """
         Асинхронная отправка email.
@@ -29,7 +83,7 @@ class EmailSender(BaseSender):
             return False
 
         email_msg = EmailMessage()
-        email_msg["From"] = settings.SMTP_FROM_EMAIL
+        email_msg["From"] = _SMTP_FROM_EMAIL
         email_msg["To"] = to_email
         email_msg["Subject"] = subject
         if msg_type == "html":
@@ -38,21 +92,21 @@ class EmailSender(BaseSender):
             email_msg.set_content(content)
 
         try:
-            async with SMTP(
-                    hostname=settings.SMTP_HOST,
-                    port=settings.SMTP_PORT,
-                    start_tls=settings.SMTP_USE_TLS
-            ) as smtp:
-                if settings.SMTP_USER and settings.SMTP_PASSWORD.get_secret_value():
-                    await smtp.login(
-                        settings.SMTP_USER,
-                        settings.SMTP_PASSWORD.get_secret_value()
-                    )
-                await smtp.send_message(email_msg)
-
-            logger.info(f"EmailSender: письмо успешно отправлено, to={to_email}")
+            # SMTP не мультиплексируется: одно соединение — одно письмо за раз
+            async with self._smtp_lock:
+                try:
+                    smtp = await self._ensure_smtp()
+                    await smtp.send_message(email_msg)
+                    self._last_used = time.monotonic()
+                except SMTPException:
+                    if self._smtp is not None:
+                        self._smtp.close()
+                    self._smtp = None
+                    raise
+
+            logger.info("EmailSender: письмо успешно отправлено, to=%s", to_email)
             return True
 
         except SMTPException as e:
-            logger.error(f"EmailSender: ошибка при отправке email: {e}")
+            logger.error("EmailSender: ошибка при отправке email: %s", e)
             return False
\ No newline at end of file
@@ -1,14 +1,78 @@
+import asyncio
 import logging
 import httpx
+import orjson
 from notifications_service.base_sender import BaseSender
 from infrastructure_layer.settings import settings
 
 logger = logging.getLogger("sms_sender")
 
+# Параметры провайдера читаются из настроек один раз при импорте
+_SMS_PROVIDER_URL = settings.SMS_PROVIDER_URL
+_SMS_SENDER_ID = settings.SMS_SENDER_ID
+_BEARER = f"Bearer {settings.SMS_API_TOKEN.get_secret_value()}"
+
+# HTTP-клиенты по event loop: пул соединений привязан к циклу, в котором создан
+_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+async def _drop_stale_clients() -> None:
+    """
+    Удаляет из реестра клиенты завершившихся event loop.
+    Их соединения нельзя закрыть штатно — закрывайте клиент через close_client()
+    до завершения цикла; здесь сокеты остаются сборщику мусора.
+    """
+    for stale_loop in [loop_ for loop_ in _clients if loop_.is_closed()]:
+        stale = _clients.pop(stale_loop)
+        try:
+            await stale.aclose()
+        except Exception as e:
+            # транспорты закрытого цикла уже недоступны — клиент просто отбрасывается
+            logger.debug("SmsSender: не удалось закрыть клиент завершённого цикла: %s", e)
+
+
+async def _get_client() -> httpx.AsyncClient:
+    """
+    Проверяет наличие HTTP-клиента текущего event loop и создаёт его если отсутствует.
+    Клиенты завершившихся циклов удаляются здесь же.
+    :return: Общий httpx.AsyncClient с пулом соединений.
+    """
+    loop = asyncio.get_running_loop()
+    await _drop_stale_clients()
+
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            headers={
+                "Accept": "application/json",
+                "Authorization": _BEARER,
+                "Content-Type": "application/json",
+            },
+        )
+    return client
+
+
+async def close_client() -> None:
+    """
+    Закрывает HTTP-клиент текущего event loop при остановке приложения
+    и удаляет клиенты уже завершившихся циклов.
+    """
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+    await _drop_stale_clients()
+
 
 class SmsSender(BaseSender):
     """Класс отправки SMS."""
 
+    async def close(self) -> None:
+        """Освобождает пул соединений при остановке приложения."""
+        await close_client()
+
     async def _send(self, data: dict):
         to = data.get("to")
         content = data.get("content")
@@ -18,21 +82,17 @@ class SmsSender(BaseSender):
             return False
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.post(
-                    settings.SMS_PROVIDER_URL,
-                    headers={
-                        "Authorization": f"Bearer {settings.SMS_API_TOKEN.get_secret_value()}",
-                        "Accept": "application/json",
-                    },
-                    json={
-                        "to": to,
-                        "from": settings.SMS_SENDER_ID,
-                        "text": content,
-                    },
-                )
-            logger.info(f"SmsSender: отправлено на {to}, статус={response.status_code}")
+            client = await _get_client()
+            response = await client.post(
+                _SMS_PROVIDER_URL,
+                content=orjson.dumps({
+                    "to": to,
+                    "from": _SMS_SENDER_ID,
+                    "text": content,
+                }),
+            )
+            logger.info("SmsSender: отправлено на %s, статус=%s", to, response.status_code)
             return response.status_code in (200, 201)
         except Exception as e:
-            logger.error(f"SmsSender: ошибка при отправке — {e}")
+            logger.error("SmsSender: ошибка при отправке — %s", e)
             return False
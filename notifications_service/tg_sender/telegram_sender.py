@@ -1,3 +1,9 @@
+import asyncio
+import os
+import stat
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from telegram import Bot, InputFile
 from telegram.error import TelegramError
 from notifications_service.base_sender import BaseSender
@@ -6,6 +12,74 @@ import logging
 
 logger = logging.getLogger("telegram_sender")
 
+# Суммарный объём кеша вложений; файлы крупнее не кешируются
+_FILE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# (путь, mtime_ns, размер) -> содержимое; изменённый файл получает новый ключ
+_file_cache: OrderedDict[tuple[str, int, int], bytes] = OrderedDict()
+_file_cache_size = 0
+_file_cache_lock = threading.Lock()
+
+
+def _read_file_cached(path: str) -> bytes | None:
+    """
+    Читает файл с диска через LRU-кеш, ограниченный _FILE_CACHE_MAX_BYTES.
+    Нужен для рассылки одного и того же вложения во множество чатов.
+    Выполняется в отдельном потоке.
+    :return: содержимое файла или None, если path не является обычным файлом.
+    """
+    global _file_cache_size
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+
+    key = (path, st.st_mtime_ns, st.st_size)
+    with _file_cache_lock:
+        data = _file_cache.get(key)
+        if data is not None:
+            _file_cache.move_to_end(key)
+            return data
+
+    data = Path(path).read_bytes()
+    if len(data) > _FILE_CACHE_MAX_BYTES:
+        return data
+
+    with _file_cache_lock:
+        if key not in _file_cache:
+            # прежние версии изменённого файла больше не понадобятся
+            for stale_key in [k for k in _file_cache if k[0] == path]:
+                _file_cache_size -= len(_file_cache.pop(stale_key))
+            _file_cache[key] = data
+            _file_cache_size += len(data)
+        while _file_cache_size > _FILE_CACHE_MAX_BYTES:
+            _, evicted = _file_cache.popitem(last=False)
+            _file_cache_size -= len(evicted)
+    return data
+
+
+async def _prepare_file(content):
+    """
+    Подготавливает вложение для send_photo/send_document:
+    - готовый InputFile передаётся без изменений;
+    - Path и строки-пути к существующим файлам читаются через кеш в отдельном потоке;
+    - прочие строки (file_id, URL) передаются Telegram как есть;
+    - bytes и файловые объекты оборачиваются в InputFile.
+    """
+    if isinstance(content, InputFile):
+        return content
+    if isinstance(content, (str, Path)):
+        path = str(content)
+        data = await asyncio.to_thread(_read_file_cached, path)
+        if data is not None:
+            return InputFile(data, filename=Path(path).name)
+        if isinstance(content, Path):
+            raise FileNotFoundError(path)
+        return content
+    return InputFile(content)
+
 
 class TelegramSender(BaseSender):
     """Отправка уведомлений через Telegram."""
@@ -23,10 +97,10 @@ class TelegramSender(BaseSender):
         await self.bot.send_message(chat_id=chat_id, text=content)
 
     async def _send_photo(self, chat_id, content):
-        await self.bot.send_photo(chat_id=chat_id, photo=InputFile(content))
+        await self.bot.send_photo(chat_id=chat_id, photo=await _prepare_file(content))
 
     async def _send_document(self, chat_id, content):
-        await self.bot.send_document(chat_id=chat_id, document=InputFile(content))
+        await self.bot.send_document(chat_id=chat_id, document=await _prepare_file(content))
 
     async def _send(self, message: dict):
         chat_id = message.get("to")
@@ -39,13 +113,18 @@ class TelegramSender(BaseSender):
 
         send_method = self._send_methods.get(msg_type)
         if not send_method:
-            logger.error(f"TelegramSender: неизвестный тип сообщения '{msg_type}'")
+            logger.error("TelegramSender: неизвестный тип сообщения '%s'", msg_type)
             return False
 
         try:
             await send_method(chat_id, content)
-            logger.info(f"TelegramSender: сообщение успешно отправлено, chat_id={chat_id}, тип={msg_type}")
+            logger.info(
+                "TelegramSender: сообщение успешно отправлено, chat_id=%s, тип=%s", chat_id, msg_type
+            )
             return True
         except TelegramError as e:
-            logger.error(f"TelegramSender: ошибка при отправке сообщения Telegram: {e}")
+            logger.error("TelegramSender: ошибка при отправке сообщения Telegram: %s", e)
+            return False
+        except OSError as e:
+            logger.error("TelegramSender: не удалось прочитать вложение: %s", e)
             return False
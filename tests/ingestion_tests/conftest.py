@@ -1,5 +1,5 @@
 import pytest_asyncio
-from ingestion.base_client import BaseClient, ResponseBody
+from ingestion.base_client import BaseClient, ResponseBody, close_session
 
 
 class DummyClient(BaseClient):
@@ -14,7 +14,8 @@ class DummyClient(BaseClient):
 @pytest_asyncio.fixture
 async def client() -> DummyClient:
     """
-    Фикстура создаёт асинхронный клиент и закрывает сессию после теста.
+    Фикстура создаёт асинхронный клиент и закрывает общую сессию после теста.
     """
     async with DummyClient("https://api.test.com") as c:
         yield c
+    await close_session()
@@ -1,10 +1,14 @@
 # tests/test_base_client.py
 
+import asyncio
 import pytest
 import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from aioresponses import aioresponses
-from ingestion.base_client import ResponseBody
-from tests.conftest import DummyClient
+from yarl import URL
+from ingestion.base_client import ResponseBody, close_session
+from tests.ingestion_tests.conftest import DummyClient
 
 
 @pytest.mark.asyncio
@@ -64,7 +68,7 @@ async def test_ensure_session_parametrized(initial_session_state, expect_new_ses
     client = DummyClient("https://api.test.com")
 
     if initial_session_state == "open":
-        client._session = aiohttp.ClientSession()
+        await client._ensure_session()
     elif initial_session_state == "closed":
         client._session = aiohttp.ClientSession()
         await client._session.close()
@@ -86,3 +90,317 @@ async def test_ensure_session_parametrized(initial_session_state, expect_new_ses
 
     if client._session and not client._session.closed:
         await client._session.close()
+
+
+@pytest.mark.asyncio
+async def test_retry_after_on_503(client: DummyClient):
+    """
+    - Первый ответ 503 с Retry-After: 0 — клиент ждёт и повторяет запрос.
+    - Второй ответ 200 возвращается вызывающему коду.
+    """
+    url = "https://api.test.com/test-endpoint"
+    expected = {"message": "ok"}
+
+    with aioresponses() as m:
+        m.get(url, status=503, headers={"Retry-After": "0"})
+        m.get(url, payload=expected, status=200)
+
+        response = await client.get("test-endpoint")
+        assert response == expected
+
+
+
+@pytest.mark.asyncio
+async def test_retry_after_above_max_delay_raises(client: DummyClient):
+    """
+    - Retry-After больше max_delay не приводит к ожиданию: ошибка поднимается сразу.
+    """
+    url = "https://api.test.com/test-endpoint"
+
+    with aioresponses() as m:
+        m.get(url, status=429, headers={"Retry-After": "3600"})
+        m.get(url, payload={"message": "ok"}, status=200)
+
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            await asyncio.wait_for(client.get("test-endpoint"), timeout=1)
+        assert exc_info.value.status == 429
+        assert len(m.requests[("GET", URL(url))]) == 1
+
+@pytest.mark.asyncio
+async def test_no_retry_on_4xx(client: DummyClient):
+    """
+    - Ответ 404 не повторяется: ошибка поднимается после первой попытки.
+    """
+    url = "https://api.test.com/test-endpoint"
+
+    with aioresponses() as m:
+        m.get(url, status=404)
+        m.get(url, payload={"message": "ok"}, status=200)
+
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            await client.get("test-endpoint")
+        assert exc_info.value.status == 404
+
+
+@pytest.mark.asyncio
+async def test_get_stream(client: DummyClient):
+    """
+    - При stream=True клиент возвращает StreamedBody, а не разобранное тело.
+    - Склеенные чанки совпадают с телом ответа, после выхода соединение освобождено.
+    """
+    url = "https://api.test.com/test-endpoint"
+    body = b'{"rows": [1, 2, 3]}'
+
+    with aioresponses() as m:
+        m.get(url, body=body, status=200, content_type="application/json")
+
+        async with await client.get("test-endpoint", stream=True) as stream:
+            received = b"".join([chunk async for chunk in stream])
+        assert received == body
+        assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_get_stream_released_without_reading():
+    """
+    - Выход из async with освобождает соединение, даже если тело не читалось.
+    """
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(body=b"x" * 1_000_000)
+
+    app = web.Application()
+    app.router.add_get("/export", handler)
+
+    async with TestServer(app) as server:
+        client = DummyClient(str(server.make_url("")))
+        async with await client.get("export", stream=True) as stream:
+            assert not stream.closed
+        assert stream.closed
+        await close_session()
+
+
+@pytest.mark.asyncio
+async def test_get_stream_longer_than_total_timeout():
+    """
+    - Потоковое тело может читаться дольше общего timeout клиента,
+      пока паузы между порциями данных меньше timeout.
+    """
+    async def handler(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for _ in range(4):
+            await response.write(b"chunk")
+            await asyncio.sleep(0.1)
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/export", handler)
+
+    async with TestServer(app) as server:
+        client = DummyClient(str(server.make_url("")), timeout=0.25)
+        async with await client.get("export", stream=True) as stream:
+            received = b"".join([chunk async for chunk in stream])
+        assert received == b"chunk" * 4
+        await close_session()
+
+
+@pytest.mark.asyncio
+async def test_retry_get_on_5xx(client: DummyClient, monkeypatch):
+    """
+    - GET с ответом 500 повторяется с backoff (задержка подменена на 0).
+    - Второй ответ 200 возвращается вызывающему коду.
+    """
+    monkeypatch.setattr(client, "_backoff_delay", lambda attempt: 0)
+    url = "https://api.test.com/test-endpoint"
+    expected = {"message": "ok"}
+
+    with aioresponses() as m:
+        m.get(url, status=500)
+        m.get(url, payload=expected, status=200)
+
+        response = await client.get("test-endpoint")
+        assert response == expected
+
+
+
+@pytest.mark.asyncio
+async def test_retry_get_on_truncated_body(client: DummyClient, monkeypatch):
+    """
+    - GET с оборванным телом ответа (ClientPayloadError) повторяется.
+    """
+    monkeypatch.setattr(client, "_backoff_delay", lambda attempt: 0)
+    url = "https://api.test.com/test-endpoint"
+    expected = {"message": "ok"}
+
+    with aioresponses() as m:
+        m.get(url, exception=aiohttp.ClientPayloadError("truncated body"))
+        m.get(url, payload=expected, status=200)
+
+        response = await client.get("test-endpoint")
+        assert response == expected
+
+@pytest.mark.asyncio
+async def test_no_retry_post_without_idempotency_key(client: DummyClient, monkeypatch):
+    """
+    - POST без Idempotency-Key не повторяется даже при 5xx.
+    """
+    monkeypatch.setattr(client, "_backoff_delay", lambda attempt: 0)
+    url = "https://api.test.com/test-endpoint"
+
+    with aioresponses() as m:
+        m.post(url, status=500)
+        m.post(url, payload={"result": "ok"}, status=200)
+
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            await client.post("test-endpoint", json={"field": "value"})
+        assert exc_info.value.status == 500
+        assert len(m.requests[("POST", URL(url))]) == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_post_with_idempotency_key(client: DummyClient, monkeypatch):
+    """
+    - POST с заголовком Idempotency-Key повторяется при 5xx.
+    """
+    monkeypatch.setattr(client, "_backoff_delay", lambda attempt: 0)
+    url = "https://api.test.com/test-endpoint"
+    expected = {"result": "ok"}
+
+    with aioresponses() as m:
+        m.post(url, status=500)
+        m.post(url, payload=expected, status=200)
+
+        response = await client.post(
+            "test-endpoint",
+            json={"field": "value"},
+            headers={"Idempotency-Key": "abc-123"},
+        )
+        assert response == expected
+        assert len(m.requests[("POST", URL(url))]) == 2
+
+
+@pytest.mark.asyncio
+async def test_throttle_spacing_fifo():
+    """
+    - Параллельные запросы с min_interval проходят по одному через каждые min_interval.
+    - Порядок прохождения совпадает с порядком вызова (FIFO).
+    - Слот отменённого ожидания не достаётся новому вызову: интервал сохраняется.
+    """
+    client = DummyClient("https://api.test.com", min_interval=0.05)
+    loop = asyncio.get_running_loop()
+    passed: list[tuple[int | str, float]] = []
+
+    async def worker(i: int | str) -> None:
+        await client._throttle()
+        passed.append((i, loop.time()))
+
+    await asyncio.gather(*(worker(i) for i in range(5)))
+
+    assert [i for i, _ in passed] == list(range(5))
+    timestamps = [ts for _, ts in passed]
+    for prev, cur in zip(timestamps, timestamps[1:]):
+        assert cur - prev == pytest.approx(0.05, abs=0.02)
+
+    client = DummyClient("https://api.test.com", min_interval=0.1)
+    passed.clear()
+    await client._throttle()  # начальный токен
+    started = loop.time()
+
+    task_a = asyncio.create_task(worker("A"))
+    task_b = asyncio.create_task(worker("B"))
+    await asyncio.sleep(0)  # A и B резервируют свои слоты
+    task_a.cancel()
+    task_c = asyncio.create_task(worker("C"))
+    await asyncio.gather(task_b, task_c)
+
+    assert task_a.cancelled()
+    assert [name for name, _ in passed] == ["B", "C"]
+    (_, ts_b), (_, ts_c) = passed
+    assert ts_b - started == pytest.approx(0.2, abs=0.03)
+    assert ts_c - ts_b == pytest.approx(0.1, abs=0.03)
+
+
+def test_bucket_key_ignores_query_string():
+    """
+    - Ключ bucket — первый сегмент пути без query-строки.
+    - Ведущий слэш не влияет на ключ.
+    """
+    client = DummyClient("https://api.test.com")
+
+    assert client._bucket_key("search?q=1") == "search"
+    assert client._bucket_key("/reports/daily?from=2024-01-01") == "reports"
+
+
+@pytest.mark.asyncio
+async def test_bucket_limiters_are_independent():
+    """
+    - Запросы в разные bucket не ждут друг друга.
+    - Повторный запрос в тот же bucket (с другой query-строкой) ждёт его квоту.
+    """
+    client = DummyClient(
+        "https://api.test.com", max_rate=100, bucket_max_rate=1, bucket_rate_period=0.3
+    )
+    loop = asyncio.get_running_loop()
+
+    with aioresponses() as m:
+        m.get("https://api.test.com/a", payload={}, status=200)
+        m.get("https://api.test.com/b", payload={}, status=200)
+        m.get("https://api.test.com/a?x=1", payload={}, status=200)
+
+        started = loop.time()
+        await asyncio.gather(client.get("a"), client.get("b"))
+        assert loop.time() - started < 0.15
+
+        await client.get("a?x=1")
+        assert loop.time() - started >= 0.25
+        assert set(client._limiters) == {"a", "b"}
+
+    await close_session()
+
+
+@pytest.mark.asyncio
+async def test_global_limiter_caps_all_buckets():
+    """
+    - Общий limiter ограничивает суммарную частоту запросов во все bucket.
+    """
+    client = DummyClient(
+        "https://api.test.com",
+        max_rate=1,
+        rate_period=0.3,
+        bucket_max_rate=10,
+        bucket_rate_period=1,
+    )
+    loop = asyncio.get_running_loop()
+
+    with aioresponses() as m:
+        m.get("https://api.test.com/a", payload={}, status=200)
+        m.get("https://api.test.com/b", payload={}, status=200)
+
+        started = loop.time()
+        await asyncio.gather(client.get("a"), client.get("b"))
+        assert loop.time() - started >= 0.25
+
+    await close_session()
+
+
+def test_shared_session_across_event_loops(unused_tcp_port: int):
+    """
+    - Два последовательных asyncio.run используют один и тот же клиент.
+    - Во втором цикле клиент получает новую сессию вместо сессии закрытого цикла.
+    """
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response({"message": "ok"})
+
+    client = DummyClient(f"http://127.0.0.1:{unused_tcp_port}")
+
+    async def run_once() -> ResponseBody:
+        app = web.Application()
+        app.router.add_get("/test-endpoint", handler)
+        async with TestServer(app, host="127.0.0.1", port=unused_tcp_port):
+            return await client.get("test-endpoint")
+
+    assert asyncio.run(run_once()) == {"message": "ok"}
+    assert asyncio.run(run_once()) == {"message": "ok"}
+
+    asyncio.run(close_session())
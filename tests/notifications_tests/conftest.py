@@ -0,0 +1,9 @@
+import os
+
+# Обязательные настройки без значений по умолчанию: Settings() читается при импорте сервисов
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test-token")
+os.environ.setdefault("KAFKA_BROKER_URL", "localhost:9092")
+os.environ.setdefault("KAFKA_TOPIC_NOTIFICATIONS", "notifications")
+os.environ.setdefault("KAFKA_TOPIC_FAILED", "notifications-failed")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SMS_API_TOKEN", "test-sms-token")
@@ -0,0 +1,59 @@
+# tests/notifications_tests/test_dispatcher.py
+
+import asyncio
+import pytest
+from notifications_service.base_sender import BaseSender
+from notifications_service.dispatcher import NotificationDispatcher
+
+
+class FailingSender(BaseSender):
+    """Отправитель, который всегда падает с исключением."""
+
+    async def _send(self, message: dict):
+        raise RuntimeError("boom")
+
+
+class TrackingSender(BaseSender):
+    """Отправитель, который считает одновременно выполняемые отправки."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def _send(self, message: dict):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return True
+
+
+@pytest.mark.asyncio
+async def test_send_batch_isolates_failures(caplog):
+    """
+    - Исключение в одном сообщении превращается в False.
+    - Результаты возвращаются в порядке входных сообщений.
+    - Ошибка логируется вместе с traceback.
+    """
+    dispatcher = NotificationDispatcher()
+    dispatcher._factories = {"bad": FailingSender, "good": TrackingSender}
+
+    results = await dispatcher.send_batch([{"channel": "bad"}, {"channel": "good"}])
+
+    assert results == [False, True]
+    [record] = [r for r in caplog.records if r.levelname == "ERROR"]
+    assert record.exc_info[0] is RuntimeError
+
+
+@pytest.mark.asyncio
+async def test_send_batch_respects_concurrency_limit():
+    """
+    - Одновременно выполняется не больше max_concurrent_tasks отправок.
+    """
+    dispatcher = NotificationDispatcher(max_concurrent_tasks=2)
+    dispatcher._factories = {"good": TrackingSender}
+
+    results = await dispatcher.send_batch([{"channel": "good"}] * 10)
+
+    assert results == [True] * 10
+    assert dispatcher._instances["good"].peak == 2
@@ -0,0 +1,138 @@
+# tests/notifications_tests/test_email_sender.py
+
+import pytest
+from aiosmtplib import SMTPAuthenticationError, SMTPServerDisconnected
+from notifications_service.email_sender import email_sender
+from notifications_service.email_sender.email_sender import EmailSender
+
+MESSAGE = {"to": "user@example.com", "subject": "Тест", "content": "Привет"}
+
+
+class FakeSMTP:
+    """
+    Заглушка aiosmtplib.SMTP: запоминает созданные соединения и отправленные письма.
+    """
+
+    instances: list["FakeSMTP"] = []
+    fail_login = False
+
+    def __init__(self, hostname, port, start_tls):
+        self.is_connected = False
+        self.closed = False
+        self.quit_called = False
+        self.noop_calls = 0
+        self.fail_send = False
+        self.sent = []
+        FakeSMTP.instances.append(self)
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def login(self, user, password):
+        if FakeSMTP.fail_login:
+            raise SMTPAuthenticationError(535, "bad credentials")
+
+    async def noop(self):
+        self.noop_calls += 1
+
+    async def send_message(self, message):
+        if self.fail_send:
+            raise SMTPServerDisconnected("connection lost")
+        self.sent.append(message)
+
+    def close(self):
+        self.is_connected = False
+        self.closed = True
+
+    async def quit(self):
+        self.quit_called = True
+        self.is_connected = False
+
+
+@pytest.fixture(autouse=True)
+def fake_smtp(monkeypatch):
+    """
+    Фикстура подменяет SMTP в модуле отправителя и сбрасывает состояние заглушки.
+    """
+    FakeSMTP.instances = []
+    FakeSMTP.fail_login = False
+    monkeypatch.setattr(email_sender, "SMTP", FakeSMTP)
+    return FakeSMTP
+
+
+@pytest.mark.asyncio
+async def test_send_reuses_connection():
+    """
+    - Два письма подряд отправляются через одно SMTP-соединение.
+    """
+    sender = EmailSender()
+
+    assert await sender._send(MESSAGE) is True
+    assert await sender._send(MESSAGE) is True
+
+    assert len(FakeSMTP.instances) == 1
+    assert len(FakeSMTP.instances[0].sent) == 2
+
+
+@pytest.mark.asyncio
+async def test_send_checks_idle_connection_with_noop(monkeypatch):
+    """
+    - Соединение, простаивавшее дольше интервала keepalive, проверяется NOOP и переиспользуется.
+    """
+    sender = EmailSender()
+    await sender._send(MESSAGE)
+    monkeypatch.setattr(email_sender, "_SMTP_KEEPALIVE_INTERVAL", 0.0)
+
+    assert await sender._send(MESSAGE) is True
+
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].noop_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_send_reconnects_after_failure():
+    """
+    - Ошибка SMTP закрывает соединение, _send возвращает False.
+    - Следующее письмо отправляется через новое соединение.
+    """
+    sender = EmailSender()
+    await sender._send(MESSAGE)
+    broken = FakeSMTP.instances[0]
+    broken.fail_send = True
+
+    assert await sender._send(MESSAGE) is False
+    assert broken.closed
+
+    assert await sender._send(MESSAGE) is True
+    assert len(FakeSMTP.instances) == 2
+    assert len(FakeSMTP.instances[1].sent) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_login_closes_new_connection(monkeypatch):
+    """
+    - Если авторизация не прошла, только что открытое соединение закрывается.
+    """
+    monkeypatch.setattr(email_sender, "_SMTP_USER", "user")
+    monkeypatch.setattr(email_sender, "_SMTP_PASSWORD", "secret")
+    FakeSMTP.fail_login = True
+    sender = EmailSender()
+
+    assert await sender._send(MESSAGE) is False
+
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].closed
+
+
+@pytest.mark.asyncio
+async def test_close_quits_connection():
+    """
+    - close() завершает SMTP-сессию командой QUIT и сбрасывает соединение.
+    """
+    sender = EmailSender()
+    await sender._send(MESSAGE)
+
+    await sender.close()
+
+    assert FakeSMTP.instances[0].quit_called
+    assert sender._smtp is None
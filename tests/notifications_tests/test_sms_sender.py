@@ -0,0 +1,47 @@
+# tests/notifications_tests/test_sms_sender.py
+
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from notifications_service.sms_sender import sms_sender
+from notifications_service.sms_sender.sms_sender import SmsSender
+
+
+def test_client_per_event_loop(unused_tcp_port: int, monkeypatch):
+    """
+    - Два последовательных asyncio.run отправляют SMS через один SmsSender.
+    - Во втором цикле создаётся новый клиент, клиент закрытого цикла удаляется из реестра.
+    - SmsSender.close() очищает реестр клиентов.
+    """
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response({"status": "queued"}, status=201)
+
+    monkeypatch.setattr(sms_sender, "_clients", {})
+    monkeypatch.setattr(
+        sms_sender, "_SMS_PROVIDER_URL", f"http://127.0.0.1:{unused_tcp_port}/sms"
+    )
+    sender = SmsSender()
+    clients = []
+
+    async def run_once() -> bool:
+        app = web.Application()
+        app.router.add_post("/sms", handler)
+        async with TestServer(app, host="127.0.0.1", port=unused_tcp_port):
+            result = await sender._send({"to": "+70000000000", "content": "Привет"})
+        clients.append(sms_sender._clients[asyncio.get_running_loop()])
+        return result
+
+    assert asyncio.run(run_once()) is True
+    assert asyncio.run(run_once()) is True
+
+    first, second = clients
+    assert first is not second
+    assert first.is_closed
+    assert list(sms_sender._clients.values()) == [second]
+
+    async def shutdown() -> None:
+        await sender.close()
+
+    asyncio.run(shutdown())
+    assert sms_sender._clients == {}
@@ -0,0 +1,96 @@
+# tests/notifications_tests/test_telegram_sender.py
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+from notifications_service.tg_sender import telegram_sender
+from notifications_service.tg_sender.telegram_sender import TelegramSender
+
+
+@pytest.fixture(autouse=True)
+def empty_file_cache(monkeypatch):
+    """
+    Фикстура подменяет кеш вложений пустым, чтобы тесты не влияли друг на друга.
+    """
+    monkeypatch.setattr(telegram_sender, "_file_cache", OrderedDict())
+    monkeypatch.setattr(telegram_sender, "_file_cache_size", 0)
+
+
+def test_read_file_cached_hit(tmp_path: Path):
+    """
+    - Повторное чтение неизменённого файла возвращает тот же объект из кеша.
+    """
+    path = tmp_path / "photo.png"
+    path.write_bytes(b"image")
+
+    first = telegram_sender._read_file_cached(str(path))
+    second = telegram_sender._read_file_cached(str(path))
+
+    assert first == b"image"
+    assert second is first
+    assert len(telegram_sender._file_cache) == 1
+
+
+def test_read_file_cached_reloads_edited_file(tmp_path: Path):
+    """
+    - Изменённый файл читается заново.
+    - Ключ прежней версии удаляется из кеша.
+    """
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"v1")
+    telegram_sender._read_file_cached(str(path))
+
+    path.write_bytes(b"v2-new")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert telegram_sender._read_file_cached(str(path)) == b"v2-new"
+    assert [key[2] for key in telegram_sender._file_cache] == [len(b"v2-new")]
+    assert telegram_sender._file_cache_size == len(b"v2-new")
+
+
+def test_read_file_cached_evicts_by_size(tmp_path: Path, monkeypatch):
+    """
+    - При превышении лимита объёма вытесняются самые старые записи.
+    - Файл крупнее лимита возвращается, но не кешируется.
+    """
+    monkeypatch.setattr(telegram_sender, "_FILE_CACHE_MAX_BYTES", 10)
+    first, second, big = tmp_path / "a", tmp_path / "b", tmp_path / "big"
+    first.write_bytes(b"123456")
+    second.write_bytes(b"abcdef")
+    big.write_bytes(b"x" * 20)
+
+    telegram_sender._read_file_cached(str(first))
+    telegram_sender._read_file_cached(str(second))
+
+    assert [key[0] for key in telegram_sender._file_cache] == [str(second)]
+    assert telegram_sender._file_cache_size == 6
+
+    assert telegram_sender._read_file_cached(str(big)) == b"x" * 20
+    assert [key[0] for key in telegram_sender._file_cache] == [str(second)]
+
+
+@pytest.mark.asyncio
+async def test_prepare_file_passes_through_file_id():
+    """
+    - Строка, не являющаяся путём к файлу (file_id, URL), передаётся как есть.
+    """
+    for value in ("AgACAgIAAxkBAAIBZ2Y", "https://example.com/photo.png"):
+        assert await telegram_sender._prepare_file(value) == value
+    assert not telegram_sender._file_cache
+
+
+@pytest.mark.asyncio
+async def test_send_missing_path_returns_false(tmp_path: Path):
+    """
+    - Отсутствующий файл, переданный как Path, не роняет отправку: _send возвращает False.
+    """
+    sender = TelegramSender()
+
+    result = await sender._send(
+        {"to": 1, "content": tmp_path / "missing.png", "type": "photo"}
+    )
+
+    assert result is False